@@ -1,50 +1,154 @@
 """
 Alpaca Client for account management and trade execution.
 """
+from __future__ import annotations
+
 import os
-from typing import List, Optional
-from alpaca.trading.client import TradingClient
-from alpaca.trading.requests import MarketOrderRequest
-from alpaca.trading.enums import OrderSide, TimeInForce
-from models import InvestmentDecision, TradeResult
-from alpaca.data.requests import StockLatestQuoteRequest
-from alpaca.data.historical import StockHistoricalDataClient
+import time
+import operator
+import socket
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional, Tuple
+from models import InvestmentDecision, Position, TradeResult
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# alpaca-py is slow to import, so each function imports what it needs on first call.
+if TYPE_CHECKING:
+    from alpaca.trading.client import TradingClient
+    from alpaca.data.historical import StockHistoricalDataClient
+
+# Credentials are read once at import so a run can't see them change midway
+_API_KEY = os.environ.get("eduardo_v2_key")
+_API_SECRET = os.environ.get("eduardo_v2_secret")
+
+# Shared TradingClient, built on first use so every call reuses one HTTP session.
+_CLIENT: Optional[TradingClient] = None
+
+# Shared market-data client for quotes, built on first use.
+_DATA_CLIENT: Optional[StockHistoricalDataClient] = None
+
+# Latest ask prices are reused for this many seconds: symbol -> (monotonic time, price).
+# get_current_stock_prices is a public helper that callers may use from several
+# threads, so cache access is kept behind a lock.
+QUOTE_CACHE_TTL = 5
+_QUOTE_CACHE: Dict[str, Tuple[float, float]] = {}
+_QUOTE_LOCK = threading.Lock()
+
+# Reads (clock, account, positions) within this many seconds reuse the cached response
+READ_CACHE_TTL = 30
+
+# Position fields reported per symbol, in Position's field order, fetched in one
+# attrgetter call per position
+_POS_FIELDS = (
+    "qty",
+    "market_value",
+    "avg_entry_price",
+    "current_price",
+    "unrealized_pl",
+    "unrealized_plpc",
+)
+_get_pos_fields = operator.attrgetter(*_POS_FIELDS)
+
+# Upper bound on concurrent order submissions
+MAX_ORDER_WORKERS = 8
+
+# Fill polling: one batched order query per interval, for at most this many attempts
+FILL_POLL_ATTEMPTS = 10
+FILL_POLL_INTERVAL = 0.5
+
+# Transient HTTP failures are retried with backoff at the connection level, so one
+# 429 or 5xx doesn't fail the run and push it to tomorrow's retry. urllib3 leaves
+# POST out of its default allowed_methods, so order submission is never repeated;
+# raise_on_status=False hands the last response back for alpaca-py to report.
+_HTTP_RETRY = Retry(
+    total=5,
+    backoff_factor=0.5,
+    status_forcelist=(429, 500, 502, 503, 504),
+    respect_retry_after_header=True,
+    raise_on_status=False,
+)
+
+# Closed-without-fill statuses that mean the order did not execute
+_UNFILLED_STATUSES = ("canceled", "expired", "rejected")
+
+
+class _LowLatencyAdapter(HTTPAdapter):
+    """HTTPAdapter whose sockets disable Nagle's algorithm and keep idle connections alive."""
+    
+    SOCKET_OPTIONS = [
+        (socket.IPPROTO_TCP, socket.TCP_NODELAY, 1),
+        (socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1),
+    ]
+    
+    def init_poolmanager(self, *args, **kwargs):
+        kwargs["socket_options"] = self.SOCKET_OPTIONS
+        super().init_poolmanager(*args, **kwargs)
+
+
+def _credentials() -> Tuple[str, str]:
+    """Return the Alpaca key and secret read at import."""
+    if not _API_KEY or not _API_SECRET:
+        raise ValueError("eduardo_v2_key / eduardo_v2_secret environment variables not set")
+    return _API_KEY, _API_SECRET
+
 
 #todo: have grok make investment decision AFTER pulling account balance, he nneds to pull stock value
 def get_alpaca_client() -> TradingClient:
-    """Initialize Alpaca client with API keys from environment."""
-    api_key = os.environ.get("eduardo_v2_key")
-    api_secret = os.environ.get("eduardo_v2_secret")
-    #potential to do: specify paper trading
-    return TradingClient(api_key, api_secret)
+    """Return the shared Alpaca client, initializing it from environment on first use."""
+    global _CLIENT
+    if _CLIENT is None:
+        import requests_cache
+        from alpaca.trading.client import TradingClient
+        
+        #potential to do: specify paper trading
+        _CLIENT = TradingClient(*_credentials())
+        # alpaca-py talks to the REST API through a requests.Session. Replace it with one
+        # that caches GETs briefly, so a retry or repeated status check in the same run
+        # doesn't hit Alpaca again, and pools its connections.
+        session = requests_cache.CachedSession(
+            backend="memory",
+            expire_after=READ_CACHE_TTL,
+            allowable_methods=("GET",),
+            # Fill polling must always see fresh order state
+            urls_expire_after={"*/orders*": requests_cache.DO_NOT_CACHE}
+        )
+        session.mount("https://", _LowLatencyAdapter(
+            pool_connections=4, pool_maxsize=16, max_retries=_HTTP_RETRY
+        ))
+        _CLIENT._session = session
+    return _CLIENT
 
 
-def get_account_info() -> dict:
+def get_account_info(client: Optional[TradingClient] = None) -> dict:
     """
     Get account information including available capital and positions.
     
+    Args:
+        client: TradingClient to use; defaults to the shared client
+    
     Returns:
         dict with account details:
         - cash: Available cash
         - portfolio_value: Total portfolio value
         - buying_power: Available buying power
-        - positions: Current positions
+        - positions: Current positions, symbol -> Position
     """
-    client = get_alpaca_client()
-    
-    account = client.get_account()
-    positions = client.get_all_positions()
-    
-    positions_dict = {}
-    for pos in positions:
-        positions_dict[pos.symbol] = {
-            "qty": float(pos.qty),
-            "market_value": float(pos.market_value),
-            "avg_entry_price": float(pos.avg_entry_price),
-            "current_price": float(pos.current_price),
-            "unrealized_pl": float(pos.unrealized_pl),
-            "unrealized_plpc": float(pos.unrealized_plpc)
-        }
+    client = client or get_alpaca_client()
+    
+    # Independent requests, so issue them together on the shared session
+    with ThreadPoolExecutor(max_workers=2) as ex:
+        f_account = ex.submit(client.get_account)
+        f_positions = ex.submit(client.get_all_positions)
+        account = f_account.result()
+        positions = f_positions.result()
+    
+    positions_dict = {
+        pos.symbol: Position(*map(float, _get_pos_fields(pos)))
+        for pos in positions
+    }
     
     return {
         "cash": float(account.cash),
@@ -54,77 +158,208 @@ def get_account_info() -> dict:
     }
 
 
+def get_data_client() -> StockHistoricalDataClient:
+    """Return the shared market-data client, initializing it from environment on first use."""
+    global _DATA_CLIENT
+    if _DATA_CLIENT is None:
+        from alpaca.data.historical import StockHistoricalDataClient
+        
+        # raw_data skips building a pydantic Quote per symbol; only the ask price is read
+        _DATA_CLIENT = StockHistoricalDataClient(*_credentials(), raw_data=True)
+        # Quotes must be live, so this session is pooled but not cached
+        _DATA_CLIENT._session.mount("https://", _LowLatencyAdapter(
+            pool_connections=4, pool_maxsize=16, max_retries=_HTTP_RETRY
+        ))
+    return _DATA_CLIENT
+
+
 def get_current_stock_price(symbol: str) -> float:
-    data_client = StockHistoricalDataClient(
-        os.environ["eduardo_v2_key"],
-        os.environ["eduardo_v2_secret"],
-    )
+    """Latest ask price for a symbol, served from the short-lived quote cache when fresh."""
+    return get_current_stock_prices([symbol])[symbol]
 
-    req = StockLatestQuoteRequest(symbol_or_symbols=symbol)  # <-- FIX
-    quotes = data_client.get_stock_latest_quote(req)
-    q = quotes[symbol]
 
-    return float(q.ask_price)
+def get_current_stock_prices(symbols: Iterable[str]) -> Dict[str, float]:
+    """
+    Latest ask prices for several symbols.
+    
+    Symbols quoted within QUOTE_CACHE_TTL seconds come from the cache; the rest
+    are fetched together in a single quote request.
+    """
+    from alpaca.data.requests import StockLatestQuoteRequest
+    
+    symbols = list(dict.fromkeys(symbols))
+    now = time.monotonic()
+    prices = {}
+    with _QUOTE_LOCK:
+        for symbol in symbols:
+            hit = _QUOTE_CACHE.get(symbol)
+            if hit is not None and now - hit[0] < QUOTE_CACHE_TTL:
+                prices[symbol] = hit[1]
+    
+    missing = [s for s in symbols if s not in prices]
+    if missing:
+        req = StockLatestQuoteRequest(symbol_or_symbols=missing)
+        quotes = get_data_client().get_stock_latest_quote(req)
+        fetched_at = time.monotonic()
+        with _QUOTE_LOCK:
+            for symbol in missing:
+                # Raw quotes use the API's short field names; "ap" is the ask price
+                prices[symbol] = float(quotes[symbol]["ap"])
+                _QUOTE_CACHE[symbol] = (fetched_at, prices[symbol])
+    
+    return prices
+
+
+def _submit_one(client: TradingClient, decision: InvestmentDecision) -> TradeResult:
+    """
+    Submit a single market order and wrap the outcome in a TradeResult.
+    Price fields are left at 0.0 for _resolve_fills to fill in.
+    """
+    from alpaca.trading.requests import MarketOrderRequest
+    from alpaca.trading.enums import OrderSide, TimeInForce
+    
+    # Map action to OrderSide
+    side = OrderSide.BUY if decision.action == "BUY" else OrderSide.SELL
+
+    try:
+        order_data = MarketOrderRequest(
+            symbol=decision.ticker,
+            qty=decision.shares,
+            side=side,
+            time_in_force=TimeInForce.DAY
+        )
+        
+        order = client.submit_order(order_data)
+        
+        return TradeResult(
+            ticker=decision.ticker,
+            shares=decision.shares,
+            action=decision.action,
+            price=0.0,
+            total_value=0.0,
+            success=True,
+            order_id=str(order.id)
+        )
+        
+    except Exception as e:
+        return TradeResult(
+            ticker=decision.ticker,
+            shares=decision.shares,
+            action=decision.action,
+            price=0.0,
+            total_value=0.0,
+            success=False,
+            error_message=str(e)
+        )
+
 
-def execute_trades(decisions: List[InvestmentDecision]) -> List[TradeResult]:
+def _resolve_fills(client: TradingClient, results: List[TradeResult], since: datetime) -> None:
+    """
+    Fill in price and total_value on submitted orders from Alpaca's fill reports.
+    
+    All pending orders are checked with one batched closed-orders query per poll
+    instead of one request per order. Orders that are still open once polling
+    runs out fall back to the latest quote. total_value uses the filled quantity;
+    orders that closed without a full fill are marked as failed.
+    """
+    from alpaca.trading.requests import GetOrdersRequest
+    from alpaca.trading.enums import QueryOrderStatus
+    
+    pending = {r.order_id: r for r in results if r.success}
+    symbols = sorted({r.ticker for r in pending.values()})
+    
+    for attempt in range(FILL_POLL_ATTEMPTS):
+        if not pending:
+            return
+        if attempt:
+            time.sleep(FILL_POLL_INTERVAL)
+        try:
+            orders = client.get_orders(GetOrdersRequest(
+                status=QueryOrderStatus.CLOSED,
+                symbols=symbols,
+                after=since,
+                limit=500
+            ))
+        except Exception:
+            break
+        
+        for order in orders:
+            result = pending.get(str(order.id))
+            if result is None:
+                continue
+            if order.filled_avg_price is not None:
+                result.price = float(order.filled_avg_price)
+                # A canceled or expired order can close after filling only part of the quantity
+                filled_qty = float(order.filled_qty)
+                result.total_value = result.price * filled_qty
+                if filled_qty < result.shares:
+                    result.success = False
+                    result.error_message = (
+                        f"Order {order.status.value} after a partial fill: "
+                        f"{filled_qty:g} of {result.shares} shares"
+                    )
+                del pending[result.order_id]
+            elif order.status.value in _UNFILLED_STATUSES:
+                result.success = False
+                result.error_message = f"Order {order.status.value} without a fill"
+                del pending[result.order_id]
+    
+    if not pending:
+        return
+    try:
+        prices = get_current_stock_prices(r.ticker for r in pending.values())
+    except Exception:
+        return
+    for result in pending.values():
+        result.price = prices[result.ticker]
+        result.total_value = result.price * result.shares
+
+
+def execute_trades(
+    decisions: List[InvestmentDecision],
+    client: Optional[TradingClient] = None
+) -> List[TradeResult]:
     """
     Execute trades based on Grok's investment decisions.
-    Supports both BUY and SELL orders.
+    Supports both BUY and SELL orders. Orders are independent, so they are
+    submitted concurrently; results keep the order of the input decisions.
+    Fill prices are then collected for all orders together.
     
     Args:
         decisions: List of investment decisions from Grok
+        client: TradingClient to use; defaults to the shared client
     
     Returns:
         List of TradeResult objects with execution details
     """
-    client = get_alpaca_client()
-    results = []
+    client = client or get_alpaca_client()
+    # Filter before touching the thread pool so only real orders get a worker
+    orders = [
+        d for d in decisions
+        if d.action in ("BUY", "SELL") and d.shares > 0
+    ]
+    if not orders:
+        return []
     
-    for decision in decisions:
-        if decision.action not in ("BUY", "SELL") or decision.shares <= 0:
-            continue
-        
-        # Map action to OrderSide
-        side = OrderSide.BUY if decision.action == "BUY" else OrderSide.SELL
-            
-        try:
-            order_data = MarketOrderRequest(
-                symbol=decision.ticker,
-                qty=decision.shares,
-                side=side,
-                time_in_force=TimeInForce.DAY
-            )
-            
-            order = client.submit_order(order_data)
-            real_filled = get_current_stock_price(decision.ticker)
-            
-            results.append(TradeResult(
-                ticker=decision.ticker,
-                shares=decision.shares,
-                action=decision.action,
-                price=real_filled,
-                total_value=real_filled * decision.shares,
-                success=True,
-                order_id=str(order.id)
-            ))
-            
-        except Exception as e:
-            results.append(TradeResult(
-                ticker=decision.ticker,
-                shares=decision.shares,
-                action=decision.action,
-                price=0.0,
-                total_value=0.0,
-                success=False,
-                error_message=str(e)
-            ))
+    # Small margin so clock skew with Alpaca can't hide our own orders from the query
+    since = datetime.now(timezone.utc) - timedelta(minutes=1)
+    with ThreadPoolExecutor(max_workers=min(MAX_ORDER_WORKERS, len(orders))) as ex:
+        futures = [ex.submit(_submit_one, client, d) for d in orders]
+        results = [f.result() for f in futures]
+    
+    _resolve_fills(client, results, since)
     
+    # Orders change cash and positions, so later reads must not see cached balances.
+    # Only the shared client's session caches; a caller's plain TradingClient has nothing to clear.
+    cache = getattr(client._session, "cache", None)
+    if cache is not None:
+        cache.clear()
     return results
 
 
-def check_market_open() -> bool:
+def check_market_open(client: Optional[TradingClient] = None) -> bool:
     """Check if the market is currently open for trading."""
-    client = get_alpaca_client()
+    client = client or get_alpaca_client()
     clock = client.get_clock()
     return clock.is_open
 
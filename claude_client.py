@@ -1,46 +1,38 @@
 """
 Claude Client for fundamental analysis.
 """
+from __future__ import annotations
+
 import os
-import json
-import anthropic
-from typing import List
+import asyncio
+import orjson
+import time
+import hashlib
+from pathlib import Path
+from typing import TYPE_CHECKING, List, Optional, Tuple
 from models import CompanyPick, FundamentalData, ClaudeResponse
 
+# Type-only; the SDK itself is imported when a client is first built.
+if TYPE_CHECKING:
+    import anthropic
 
-def get_claude_client() -> anthropic.Anthropic:
-    """Initialize Anthropic client with API key from environment."""
-    api_key = os.environ.get("claude_main")
-    if not api_key:
-        raise ValueError("claude_main environment variable not set")
-    return anthropic.Anthropic(api_key=api_key)
+# Read once at import; checked when a client is first built.
+_API_KEY = os.environ.get("claude_main")
 
+# Shared Anthropic client, built on first use.
+_CLIENT: Optional[anthropic.Anthropic] = None
 
-def analyze_fundamentals(picks: List[CompanyPick]) -> ClaudeResponse:
-    """
-    Use Claude to analyze fundamental data for the given companies.
-    Returns fundamental metrics and analysis for each company.
-    """
-    client = get_claude_client()
-    
-    # Build input JSON for Claude
-    input_data = {
-        "companies": [
-            {
-                "company": p.company,
-                "ticker": p.ticker,
-                "rationale": p.rationale,
-                "news_summary": p.news_summary
-            }
-            for p in picks
-        ]
-    }
-    
-    prompt = f"""You are a financial analyst specializing in fundamental analysis.
+# Shared AsyncAnthropic client and the event loop it was built on; its connection
+# pool is bound to that loop, so a new loop gets a new client.
+_ASYNC_CLIENT: Optional[anthropic.AsyncAnthropic] = None
+_ASYNC_LOOP: Optional[asyncio.AbstractEventLoop] = None
+
+# Prompt skeleton; only the companies payload is filled in per call.
+_CLAUDE_PROMPT_TMPL = """You are a financial analyst specializing in fundamental analysis.
 
 You have received the following companies selected for potential investment:
 
-{json.dumps(input_data, indent=2)}
+{payload}
 
 For each company, provide fundamental analysis including:
 1. P/E Ratio (price-to-earnings)
@@ -53,7 +45,7 @@ For each company, provide fundamental analysis including:
 8. Any additional relevant metrics based on the news provided
 9. Analysis notes connecting the fundamentals to the news/rationale
 
-Return your response as a JSON object with the following structure:
+Return your analysis by calling the return_fundamentals tool with the following structure:
 {{
     "fundamentals": [
         {{
@@ -72,10 +64,142 @@ Return your response as a JSON object with the following structure:
     ]
 }}
 
-Use realistic market data. If you don't have exact figures, provide reasonable estimates based on the company's profile.
-Return ONLY the JSON object, no additional text."""
+Use realistic market data. If you don't have exact figures, provide reasonable estimates based on the company's profile."""
+
+_NUMBER_OR_NULL = {"type": ["number", "null"]}
+
+# Forced tool call: Claude returns the fundamentals as structured tool input,
+# so no JSON has to be recovered from free text.
+_FUNDAMENTALS_TOOL = {
+    "name": "return_fundamentals",
+    "description": "Return the fundamental analysis for every company.",
+    "input_schema": {
+        "type": "object",
+        "properties": {
+            "fundamentals": {
+                "type": "array",
+                "items": {
+                    "type": "object",
+                    "properties": {
+                        "company": {"type": "string"},
+                        "ticker": {"type": "string"},
+                        "pe_ratio": _NUMBER_OR_NULL,
+                        "cash_flow": _NUMBER_OR_NULL,
+                        "revenue": _NUMBER_OR_NULL,
+                        "market_cap": _NUMBER_OR_NULL,
+                        "debt_to_equity": _NUMBER_OR_NULL,
+                        "earnings_growth": _NUMBER_OR_NULL,
+                        "dividend_yield": _NUMBER_OR_NULL,
+                        "additional_metrics": {"type": "object"},
+                        "analysis_notes": {"type": "string"}
+                    },
+                    "required": ["company", "ticker"]
+                }
+            }
+        },
+        "required": ["fundamentals"]
+    }
+}
+
+
+# Per-ticker fundamentals cache. Fundamentals move quarterly, so a week-old
+# analysis is reused unless the news driving the pick has changed.
+CACHE_DIR = Path(os.environ.get("EDUARDO_CACHE_DIR", ".cache")) / "fundamentals"
+CACHE_TTL_SECONDS = 7 * 86400
+
+
+def _cache_path(pick: CompanyPick) -> Path:
+    """Cache file for a pick, keyed by ticker and a digest of its news summary."""
+    digest = hashlib.sha256(pick.news_summary.encode()).hexdigest()[:16]
+    return CACHE_DIR / f"{pick.ticker}-{digest}.json"
+
+
+def _load_cached(pick: CompanyPick) -> Optional[FundamentalData]:
+    """Return cached fundamentals for a pick, or None if missing, stale or unreadable."""
+    try:
+        entry = orjson.loads(_cache_path(pick).read_bytes())
+    except (OSError, orjson.JSONDecodeError):
+        return None
+    if time.time() - entry.get("ts", 0) > CACHE_TTL_SECONDS:
+        return None
+    try:
+        return FundamentalData.from_dict(entry["data"])
+    except (KeyError, TypeError):
+        return None
+
+
+def _store_cached(pick: CompanyPick, fundamental: FundamentalData) -> None:
+    """Write fundamentals for a pick to the cache; failures are non-fatal."""
+    try:
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        _cache_path(pick).write_bytes(orjson.dumps({"ts": time.time(), "data": fundamental}))
+    except OSError:
+        pass
+
+
+def _api_key() -> str:
+    """Return the Anthropic API key read from environment at import."""
+    if not _API_KEY:
+        raise ValueError("claude_main environment variable not set")
+    return _API_KEY
+
+
+def get_claude_client() -> anthropic.Anthropic:
+    """Return the shared Anthropic client, initializing it from environment on first use."""
+    global _CLIENT
+    if _CLIENT is None:
+        import anthropic
+        _CLIENT = anthropic.Anthropic(api_key=_api_key())
+    return _CLIENT
+
+
+def get_async_claude_client() -> anthropic.AsyncAnthropic:
+    """Return the AsyncAnthropic client for the running event loop, creating it on first use there."""
+    global _ASYNC_CLIENT, _ASYNC_LOOP
+    loop = asyncio.get_running_loop()
+    if _ASYNC_CLIENT is None or _ASYNC_LOOP is not loop:
+        import anthropic
+        _ASYNC_CLIENT = anthropic.AsyncAnthropic(api_key=_api_key())
+        _ASYNC_LOOP = loop
+    return _ASYNC_CLIENT
 
-    response = client.messages.create(
+
+def _partition_cached(picks: List[CompanyPick]) -> Tuple[List[FundamentalData], List[CompanyPick]]:
+    """Split picks into cached fundamentals and the picks that still need analysis."""
+    cached = []
+    uncached = []
+    for p in picks:
+        hit = _load_cached(p)
+        if hit is not None:
+            cached.append(hit)
+        else:
+            uncached.append(p)
+    return cached, uncached
+
+
+def _request_kwargs(picks: List[CompanyPick]) -> dict:
+    """Arguments for the fundamentals message, shared by the sync and async paths."""
+    # Build input JSON for Claude
+    input_data = {
+        "companies": [
+            {
+                k: v for k, v in (
+                    ("company", p.company),
+                    ("ticker", p.ticker),
+                    ("rationale", p.rationale),
+                    ("news_summary", p.news_summary)
+                )
+                if v  # empty strings only cost prompt tokens
+            }
+            for p in picks
+        ]
+    }
+    
+    prompt = _CLAUDE_PROMPT_TMPL.format(
+        payload=orjson.dumps(input_data).decode()
+    )
+
+    return dict(
         model="claude-sonnet-4-20250514",
         max_tokens=4096,
         messages=[
@@ -83,37 +207,59 @@ Return ONLY the JSON object, no additional text."""
                 "role": "user",
                 "content": prompt
             }
-        ]
+        ],
+        tools=[_FUNDAMENTALS_TOOL],
+        tool_choice={"type": "tool", "name": _FUNDAMENTALS_TOOL["name"]}
     )
+
+
+def _parse_response(message, cached: List[FundamentalData], uncached: List[CompanyPick]) -> ClaudeResponse:
+    """Read Claude's tool call, cache the fresh fundamentals and merge them with the cached ones."""
+    data = next((block.input for block in message.content if block.type == "tool_use"), None)
+    if data is None:
+        # e.g. a refusal or a max_tokens cutoff before the tool call was written
+        raise ValueError(
+            f"Claude returned no {_FUNDAMENTALS_TOOL['name']} tool call "
+            f"(stop_reason={message.stop_reason!r})"
+        )
     
-    content = response.content[0].text
+    fundamentals = [FundamentalData.from_dict(f) for f in data["fundamentals"]]
     
-    # Parse JSON from response (handle potential markdown code blocks)
-    if "```json" in content:
-        content = content.split("```json")[1].split("```")[0]
-    elif "```" in content:
-        content = content.split("```")[1].split("```")[0]
+    pick_map = {p.ticker: p for p in uncached}
+    for f in fundamentals:
+        if f.ticker in pick_map:
+            _store_cached(pick_map[f.ticker], f)
     
-    data = json.loads(content.strip())
+    return ClaudeResponse(fundamentals=cached + fundamentals)
+
+
+def analyze_fundamentals(picks: List[CompanyPick]) -> ClaudeResponse:
+    """
+    Use Claude to analyze fundamental data for the given companies.
+    Returns fundamental metrics and analysis for each company.
+    Companies with a fresh cache entry are served from disk and left out of the prompt.
+    """
+    cached, uncached = _partition_cached(picks)
+    if not uncached:
+        return ClaudeResponse(fundamentals=cached)
     
-    fundamentals = [
-        FundamentalData(
-            company=f["company"],
-            ticker=f["ticker"],
-            pe_ratio=f.get("pe_ratio"),
-            cash_flow=f.get("cash_flow"),
-            revenue=f.get("revenue"),
-            market_cap=f.get("market_cap"),
-            debt_to_equity=f.get("debt_to_equity"),
-            earnings_growth=f.get("earnings_growth"),
-            dividend_yield=f.get("dividend_yield"),
-            additional_metrics=f.get("additional_metrics", {}),
-            analysis_notes=f.get("analysis_notes", "")
-        )
-        for f in data["fundamentals"]
-    ]
+    client = get_claude_client()
+    # Streaming keeps long generations from hitting read timeouts; the reply is still parsed once complete
+    with client.messages.stream(**_request_kwargs(uncached)) as stream:
+        message = stream.get_final_message()
+    return _parse_response(message, cached, uncached)
+
+
+async def analyze_fundamentals_async(picks: List[CompanyPick]) -> ClaudeResponse:
+    """Async variant of analyze_fundamentals() so callers can overlap it with other I/O."""
+    cached, uncached = _partition_cached(picks)
+    if not uncached:
+        return ClaudeResponse(fundamentals=cached)
     
-    return ClaudeResponse(fundamentals=fundamentals)
+    client = get_async_claude_client()
+    async with client.messages.stream(**_request_kwargs(uncached)) as stream:
+        message = await stream.get_final_message()
+    return _parse_response(message, cached, uncached)
 
 
 if __name__ == "__main__":
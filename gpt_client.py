@@ -1,29 +1,39 @@
 """
 GPT Client for news research and company selection.
 """
+from __future__ import annotations
+
 import os
-import json
-from openai import OpenAI, RateLimitError
+import asyncio
+import orjson
+from datetime import date
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, Optional, Tuple
 from models import CompanyPick, GPTResponse
 
+# Type-only; the SDK is imported inside the client getters.
+if TYPE_CHECKING:
+    from openai import OpenAI, AsyncOpenAI
 
-def get_gpt_client() -> OpenAI:
-    """Initialize OpenAI client with API key from environment."""
-    api_key = os.environ.get("gpt_main")
-    if not api_key:
-        raise ValueError("gpt_main environment variable not set")
-    # Fail fast on quota errors rather than retrying multiple times.
-    return OpenAI(api_key=api_key, max_retries=0)
+# Settings are read once at import; the key is validated when a client is built.
+_API_KEY = os.environ.get("gpt_main")
+GPT_MODEL = os.environ.get("GPT_MODEL", "gpt-4o")
 
+# Shared OpenAI client, built on first use.
+_CLIENT: Optional[OpenAI] = None
 
-def research_companies() -> GPTResponse:
-    """
-    Use GPT to search news and current happenings.
-    Returns 5 companies to invest in with rationale.
-    """
-    client = get_gpt_client()
-    
-    prompt = """You are a financial research analyst. Search through recent news and current market happenings.
+# Shared AsyncOpenAI client and the event loop it was built on; its connection
+# pool is bound to that loop, so a new loop gets a new client.
+_ASYNC_CLIENT: Optional[AsyncOpenAI] = None
+_ASYNC_LOOP: Optional[asyncio.AbstractEventLoop] = None
+
+# Same-day pick cache keyed by (date, model): the news doesn't change between a
+# failed run and its retry, so the GPT call is only paid once per day. Entries are
+# kept in memory and mirrored to disk so a restarted process can reuse them too.
+CACHE_DIR = Path(os.environ.get("EDUARDO_CACHE_DIR", ".cache")) / "picks"
+_PICKS_CACHE: Dict[Tuple[str, str], GPTResponse] = {}
+
+_RESEARCH_PROMPT = """You are a financial research analyst. Search through recent news and current market happenings.
 
 Your task:
 1. Identify 5 promising companies for potential investment based on recent positive news, market trends, or catalysts.
@@ -54,29 +64,95 @@ Return your response as a JSON object with the following structure:
 
 Return ONLY the JSON object, no additional text."""
 
-    model = os.environ.get("GPT_MODEL", "gpt-4o")
+
+def _api_key() -> str:
+    """Return the OpenAI API key read from environment at import."""
+    if not _API_KEY:
+        raise ValueError("gpt_main environment variable not set")
+    return _API_KEY
+
+
+def get_gpt_client() -> OpenAI:
+    """Return the shared OpenAI client, initializing it from environment on first use."""
+    global _CLIENT
+    if _CLIENT is None:
+        from openai import OpenAI
+        # Fail fast on quota errors rather than retrying multiple times.
+        _CLIENT = OpenAI(api_key=_api_key(), max_retries=0)
+    return _CLIENT
+
+
+def get_async_gpt_client() -> AsyncOpenAI:
+    """Return the AsyncOpenAI client for the running event loop, creating it on first use there."""
+    global _ASYNC_CLIENT, _ASYNC_LOOP
+    loop = asyncio.get_running_loop()
+    if _ASYNC_CLIENT is None or _ASYNC_LOOP is not loop:
+        from openai import AsyncOpenAI
+        # Fail fast on quota errors rather than retrying multiple times.
+        _ASYNC_CLIENT = AsyncOpenAI(api_key=_api_key(), max_retries=0)
+        _ASYNC_LOOP = loop
+    return _ASYNC_CLIENT
+
+
+def _cache_key() -> Tuple[str, str]:
+    """Key for today's picks from the configured model."""
+    return date.today().isoformat(), GPT_MODEL
+
+
+def _cache_path(key: Tuple[str, str]) -> Path:
+    day, model = key
+    return CACHE_DIR / f"{day}-{model.replace('/', '_')}.json"
+
+
+def _load_cached(key: Tuple[str, str]) -> Optional[GPTResponse]:
+    """Return today's cached picks from memory or disk, or None if there are none."""
+    if key in _PICKS_CACHE:
+        return _PICKS_CACHE[key]
     try:
-        response = client.chat.completions.create(
-            model=model,
-            messages=[
-                {
-                    "role": "system",
-                    "content": "You are a financial research analyst providing investment recommendations based on current news and market analysis. Always respond with valid JSON."
-                },
-                {
-                    "role": "user",
-                    "content": prompt
-                }
-            ],
-            temperature=0.7,
-            response_format={"type": "json_object"}
+        data = orjson.loads(_cache_path(key).read_bytes())
+        response = GPTResponse(
+            picks=[CompanyPick(**p) for p in data["picks"]],
+            timestamp=data["timestamp"]
         )
-    except RateLimitError:
-        # Bubble up cleanly; main.py handles this with an actionable message.
-        raise
-    
+    except (OSError, orjson.JSONDecodeError, KeyError, TypeError):
+        return None
+    _PICKS_CACHE[key] = response
+    return response
+
+
+def _store_cached(key: Tuple[str, str], response: GPTResponse) -> None:
+    """Remember picks in memory and on disk; disk failures are non-fatal."""
+    _PICKS_CACHE[key] = response
+    try:
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        _cache_path(key).write_bytes(orjson.dumps(response))
+    except OSError:
+        pass
+
+
+def _request_kwargs() -> dict:
+    """Arguments for the research chat completion, shared by the sync and async paths."""
+    return dict(
+        model=GPT_MODEL,
+        messages=[
+            {
+                "role": "system",
+                "content": "You are a financial research analyst providing investment recommendations based on current news and market analysis. Always respond with valid JSON."
+            },
+            {
+                "role": "user",
+                "content": _RESEARCH_PROMPT
+            }
+        ],
+        temperature=0.7,
+        response_format={"type": "json_object"}
+    )
+
+
+def _parse_response(response) -> GPTResponse:
+    """Build a GPTResponse from the chat completion."""
     content = response.choices[0].message.content
-    data = json.loads(content)
+    data = orjson.loads(content)
     
     picks = [
         CompanyPick(
@@ -95,6 +171,40 @@ Return ONLY the JSON object, no additional text."""
     return GPTResponse(picks=picks)
 
 
+def research_companies() -> GPTResponse:
+    """
+    Use GPT to search news and current happenings.
+    Returns 5 companies to invest in with rationale.
+    Picks are cached per day and model, so same-day retries skip the GPT call.
+    """
+    key = _cache_key()
+    cached = _load_cached(key)
+    if cached is not None:
+        return cached
+    
+    client = get_gpt_client()
+    # RateLimitError bubbles up cleanly; main.py handles it with an actionable message.
+    response = client.chat.completions.create(**_request_kwargs())
+    result = _parse_response(response)
+    _store_cached(key, result)
+    return result
+
+
+async def research_companies_async() -> GPTResponse:
+    """Async variant of research_companies() so callers can overlap it with other I/O."""
+    key = _cache_key()
+    cached = _load_cached(key)
+    if cached is not None:
+        return cached
+    
+    client = get_async_gpt_client()
+    # RateLimitError bubbles up cleanly; main.py handles it with an actionable message.
+    response = await client.chat.completions.create(**_request_kwargs())
+    result = _parse_response(response)
+    _store_cached(key, result)
+    return result
+
+
 if __name__ == "__main__":
     # Test the client
     result = research_companies()
@@ -2,88 +2,66 @@
 Grok Client for investment decision making.
 Uses xAI API with OpenAI-compatible interface.
 """
+from __future__ import annotations
+
 import os
-import json
-from openai import OpenAI
-from typing import List
-from xai_sdk import Client
-from xai_sdk.chat import user, system
+import orjson
+from typing import TYPE_CHECKING, List, Optional, Tuple
 from models import (
     CompanyPick, 
     FundamentalData, 
+    ClaudeResponse,
     InvestmentDecision, 
     GrokResponse
 )
 
+# Type-only; imported for real in get_grok_client().
+if TYPE_CHECKING:
+    from openai import OpenAI
+
+# Read at import; validated in get_grok_client().
+_API_KEY = os.environ.get("grok_main")
+
+# Shared xAI (OpenAI-compatible) client, built on first use.
+_CLIENT: Optional[OpenAI] = None
+
 
 def get_grok_client() -> OpenAI:
-    """Initialize Grok client with API key from environment."""
-    api_key = os.environ.get("grok_main")
-    if not api_key:
-        raise ValueError("grok_main environment variable not set")
-    return OpenAI(
-        api_key=api_key,
-        base_url="https://api.x.ai/v1"
-    )
+    """Return the shared Grok client, initializing it from environment on first use."""
+    global _CLIENT
+    if _CLIENT is None:
+        from openai import OpenAI
+        
+        if not _API_KEY:
+            raise ValueError("grok_main environment variable not set")
+        _CLIENT = OpenAI(
+            api_key=_API_KEY,
+            base_url="https://api.x.ai/v1"
+        )
+    return _CLIENT
 
 
-def make_investment_decision(
-    picks: List[CompanyPick],
-    fundamentals: List[FundamentalData],
-    available_capital: float,
-    current_positions: dict
-) -> GrokResponse:
-    """
-    Use Grok to make quantitative investment decisions.
-    
-    Args:
-        picks: Company picks from GPT with news/rationale
-        fundamentals: Fundamental data from Claude
-        available_capital: Available cash in Alpaca account
-        current_positions: Current portfolio positions for risk analysis
-    
-    Returns:
-        GrokResponse with investment decisions
-    """
-    client = get_grok_client()
-    
-    # Build comprehensive input data
-    input_data = {
-        "companies": [],
-        "available_capital": available_capital,
-        "current_positions": current_positions
-    }
-    
-    # Merge picks and fundamentals
-    fund_map = {f.ticker: f for f in fundamentals}
-    for pick in picks:
-        company_data = {
-            "company": pick.company,
-            "ticker": pick.ticker,
-            "news_rationale": pick.rationale,
-            "news_summary": pick.news_summary
-        }
-        if pick.ticker in fund_map:
-            f = fund_map[pick.ticker]
-            company_data["fundamentals"] = {
-                "pe_ratio": f.pe_ratio,
-                "cash_flow": f.cash_flow,
-                "revenue": f.revenue,
-                "market_cap": f.market_cap,
-                "debt_to_equity": f.debt_to_equity,
-                "earnings_growth": f.earnings_growth,
-                "dividend_yield": f.dividend_yield,
-                "additional_metrics": f.additional_metrics,
-                "analysis_notes": f.analysis_notes
-            }
-        input_data["companies"].append(company_data)
-    
-    prompt = f"""You are a quantitative investment analyst making executive investment decisions.
+# FundamentalData fields forwarded to Grok, and the values treated as "no data"
+_FUNDAMENTAL_FIELDS = (
+    "pe_ratio",
+    "cash_flow",
+    "revenue",
+    "market_cap",
+    "debt_to_equity",
+    "earnings_growth",
+    "dividend_yield",
+    "additional_metrics",
+    "analysis_notes",
+)
+_EMPTY_VALUES = (None, "", {}, [])
+
+# Prompt skeleton; the payload, capital and optional extra section are filled in per call.
+_DECISION_PROMPT_TMPL = """You are a quantitative investment analyst making executive investment decisions.
 
 CRITICAL: You must be QUANTITATIVE and DATA-DRIVEN in your decision making. Use specific numbers and metrics.
 
 INPUT DATA:
-{json.dumps(input_data, indent=2)}
+{payload}
 
 YOUR TASK:
 1. Analyze the portfolio risk based on current positions
@@ -135,8 +113,59 @@ RULES:
 - Provide specific share counts based on approximate current prices
 - Confidence should be 0-1 scale based on data quality
 
-Return ONLY the JSON object, no additional text."""
+{extra}Return ONLY the JSON object, no additional text."""
+
+
+def _build_input(
+    picks: List[CompanyPick],
+    fundamentals: List[FundamentalData],
+    available_capital: float,
+    current_positions: dict
+) -> dict:
+    """Merge GPT picks, Claude fundamentals and account state into Grok's input payload."""
+    # Build comprehensive input data
+    input_data = {
+        "companies": [],
+        "available_capital": available_capital,
+        "current_positions": current_positions
+    }
+    
+    # Merge picks and fundamentals
+    fund_map = {f.ticker: f for f in fundamentals}
+    for pick in picks:
+        company_data = {
+            "company": pick.company,
+            "ticker": pick.ticker,
+            "news_rationale": pick.rationale,
+            "news_summary": pick.news_summary
+        }
+        if pick.ticker in fund_map:
+            f = fund_map[pick.ticker]
+            # Missing metrics carry no information; leaving them out saves prompt tokens
+            fundamentals_dict = {
+                k: v for k in _FUNDAMENTAL_FIELDS
+                if (v := getattr(f, k)) not in _EMPTY_VALUES
+            }
+            if fundamentals_dict:
+                company_data["fundamentals"] = fundamentals_dict
+        input_data["companies"].append(company_data)
+    
+    return input_data
+
+
+def _decision_prompt(input_data: dict, available_capital: float, extra: str = "") -> str:
+    """Render the investment-decision prompt; `extra` is inserted ahead of the closing instruction."""
+    return _DECISION_PROMPT_TMPL.format(
+        payload=orjson.dumps(input_data).decode(),
+        available_capital=available_capital,
+        extra=extra
+    )
+
 
+def _ask_grok(prompt: str) -> dict:
+    """Send a prompt to Grok and return the parsed JSON reply."""
+    client = get_grok_client()
+    
     response = client.chat.completions.create(
         model='grok-4',
         messages=[
@@ -149,19 +178,23 @@ Return ONLY the JSON object, no additional text."""
                 "content": prompt
             }
         ],
-        temperature=0.3  # Lower temperature for more consistent, analytical responses
+        temperature=0.3,  # Lower temperature for more consistent, analytical responses
+        response_format={"type": "json_object"},
+        # Streamed to avoid read timeouts on long generations; the JSON is parsed once the stream ends
+        stream=True
     )
     
-    content = response.choices[0].message.content
-    
-    # Parse JSON from response
-    if "```json" in content:
-        content = content.split("```json")[1].split("```")[0]
-    elif "```" in content:
-        content = content.split("```")[1].split("```")[0]
-    
-    data = json.loads(content.strip())
+    content = "".join(
+        chunk.choices[0].delta.content or ""
+        for chunk in response
+        if chunk.choices
+    )
     
+    return orjson.loads(content)
+
+
+def _parse_decisions(data: dict, available_capital: float) -> GrokResponse:
+    """Build a GrokResponse from Grok's parsed JSON reply."""
     decisions = [
         InvestmentDecision(
             company=d["company"],
@@ -173,6 +206,8 @@ Return ONLY the JSON object, no additional text."""
             risk_assessment=d["risk_assessment"]
         )
         for d in data["decisions"]
+        # HOLDs and zero-share decisions are never executed, so don't build them
+        if d["action"] in ("BUY", "SELL") and d["shares"] > 0
     ]
     
     return GrokResponse(
@@ -182,6 +217,78 @@ Return ONLY the JSON object, no additional text."""
     )
 
 
+def make_investment_decision(
+    picks: List[CompanyPick],
+    fundamentals: List[FundamentalData],
+    available_capital: float,
+    current_positions: dict
+) -> GrokResponse:
+    """
+    Use Grok to make quantitative investment decisions.
+    
+    Args:
+        picks: Company picks from GPT with news/rationale
+        fundamentals: Fundamental data from Claude
+        available_capital: Available cash in Alpaca account
+        current_positions: Current portfolio positions for risk analysis
+    
+    Returns:
+        GrokResponse with investment decisions
+    """
+    input_data = _build_input(picks, fundamentals, available_capital, current_positions)
+    data = _ask_grok(_decision_prompt(input_data, available_capital))
+    return _parse_decisions(data, available_capital)
+
+
+_FUSED_FUNDAMENTALS_SECTION = """FUNDAMENTALS:
+No fundamental data has been supplied for these companies. Before deciding, derive the key
+fundamentals for each company yourself using realistic market data (or reasonable estimates
+based on the company's profile), and base your decisions on them.
+
+Add a top-level "fundamentals" array to your JSON response alongside "decisions":
+    "fundamentals": [
+        {
+            "company": "Company Name",
+            "ticker": "TICK",
+            "pe_ratio": 25.5,
+            "cash_flow": 5000,
+            "revenue": 50000,
+            "market_cap": 200,
+            "debt_to_equity": 0.5,
+            "earnings_growth": 15.5,
+            "dividend_yield": 1.2,
+            "additional_metrics": {"metric_name": "value"},
+            "analysis_notes": "How fundamentals relate to the news and investment thesis"
+        }
+    ]
+Units: cash_flow and revenue in millions, market_cap in billions, earnings_growth and dividend_yield in percent.
+
+"""
+
+
+def make_fused_investment_decision(
+    picks: List[CompanyPick],
+    available_capital: float,
+    current_positions: dict
+) -> Tuple[ClaudeResponse, GrokResponse]:
+    """
+    Use a single Grok call to both derive fundamentals and make investment decisions,
+    replacing the separate Claude round-trip.
+    
+    Args:
+        picks: Company picks from GPT with news/rationale
+        available_capital: Available cash in Alpaca account
+        current_positions: Current portfolio positions for risk analysis
+    
+    Returns:
+        (ClaudeResponse, GrokResponse) - the fundamentals Grok used, and its decisions
+    """
+    input_data = _build_input(picks, [], available_capital, current_positions)
+    data = _ask_grok(_decision_prompt(input_data, available_capital, _FUSED_FUNDAMENTALS_SECTION))
+    fundamentals = [FundamentalData.from_dict(f) for f in data.get("fundamentals", [])]
+    return ClaudeResponse(fundamentals=fundamentals), _parse_decisions(data, available_capital)
+
+
 if __name__ == "__main__":
     # Test with sample data
     from models import CompanyPick, FundamentalData
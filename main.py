@@ -7,60 +7,99 @@ Scheduler runs every Monday at 8:30 AM CDT:
 3. Grok makes quantitative investment decisions
 4. Alpaca executes trades
 
+With EDUARDO_FUSED=1, steps 2 and 3 are collapsed into a single Grok call.
+
 If trades fail, retry next day. Otherwise, resume next Monday.
 """
+import os
+import asyncio
 import logging
 import argparse
 from datetime import datetime
+from typing import TYPE_CHECKING, Optional, Tuple
 
 from scheduler import EduardoScheduler, CDT
-from gpt_client import research_companies
-from claude_client import analyze_fundamentals
-from grok_client import make_investment_decision
-from alpaca_client import get_account_info, execute_trades, check_market_open
-from models import TradeResult
-from openai import RateLimitError
+from gpt_client import research_companies_async
+from claude_client import analyze_fundamentals_async
+from grok_client import make_investment_decision, make_fused_investment_decision
+from alpaca_client import get_alpaca_client, get_account_info, execute_trades, check_market_open
+from models import TradeResult, GPTResponse, ClaudeResponse
+
+if TYPE_CHECKING:
+    from alpaca.trading.client import TradingClient
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler('eduardo.log'),
-        logging.StreamHandler()
-    ]
-)
+# Logging (queued file + console output) is configured when scheduler is imported
 logger = logging.getLogger(__name__)
 
+# Single-Grok-call mode (see make_fused_investment_decision); read once at startup
+FUSED = os.environ.get("EDUARDO_FUSED") == "1"
+
+
+async def _gather_research(
+    alpaca: "TradingClient",
+    fused: bool
+) -> Tuple[dict, GPTResponse, Optional[ClaudeResponse]]:
+    """
+    Run Steps 1-3 concurrently: the account fetch is independent of GPT, and
+    Claude only needs GPT's picks, so none of them wait on Alpaca.
+    
+    Returns:
+        (account_info, gpt_response, claude_response); claude_response is None in fused mode
+    """
+    # Step 1: Get account info from Alpaca (alpaca-py is sync-only, so run it on a thread)
+    logger.info("Step 1: Fetching account info from Alpaca...")
+    acct_task = asyncio.create_task(asyncio.to_thread(get_account_info, alpaca))
+    
+    # Step 2: GPT researches and picks 5 companies
+    logger.info("Step 2: GPT researching news and selecting companies...")
+    gpt_response = await research_companies_async()
+    
+    # Step 3: Claude analyzes fundamentals (folded into Grok's call in fused mode)
+    claude_task = None
+    if not fused:
+        logger.info("Step 3: Claude analyzing fundamental data...")
+        claude_task = asyncio.create_task(analyze_fundamentals_async(gpt_response.picks))
+    
+    logger.info(f"  GPT selected {len(gpt_response.picks)} companies:")
+    for pick in gpt_response.picks:
+        logger.info(f"    - {pick.ticker}: {pick.company}")
+    
+    # Both tasks are already in flight; awaiting them in turn costs no extra wait
+    account_info = await acct_task
+    claude_response = await claude_task if claude_task is not None else None
+    
+    logger.info(f"  Available capital: ${account_info['cash']:,.2f}")
+    logger.info(f"  Portfolio value: ${account_info['portfolio_value']:,.2f}")
+    logger.info(f"  Current positions: {len(account_info['positions'])}")
+    
+    return account_info, gpt_response, claude_response
+
 
 def run_trading_pipeline() -> bool:
     """
     Execute the full EDUARDO-V2 trading pipeline.
     
+    Set EDUARDO_FUSED=1 to skip the Claude step and let a single Grok call
+    derive fundamentals and make decisions.
+    
     Returns:
         True if all trades succeeded, False otherwise
     """
+    # Imported here rather than at module level so startup doesn't pay for the OpenAI SDK
+    from openai import RateLimitError
+    
     try:
+        # One Alpaca client for the whole run, shared by every step below
+        alpaca = get_alpaca_client()
+        
         # Step 0: Check if market is open
         logger.info("Checking market status...")
-        if not check_market_open():
+        if not check_market_open(alpaca):
             logger.warning("Market is closed. Will retry when market opens.")
             return False
         
-        # Step 1: Get account info from Alpaca
-        logger.info("Step 1: Fetching account info from Alpaca...")
-        account_info = get_account_info()
-        available_capital = account_info["cash"]
-        current_positions = account_info["positions"]
-        
-        logger.info(f"  Available capital: ${available_capital:,.2f}")
-        logger.info(f"  Portfolio value: ${account_info['portfolio_value']:,.2f}")
-        logger.info(f"  Current positions: {len(current_positions)}")
-        
-        # Step 2: GPT researches and picks 5 companies
-        logger.info("Step 2: GPT researching news and selecting companies...")
         try:
-            gpt_response = research_companies()
+            account_info, gpt_response, claude_response = asyncio.run(_gather_research(alpaca, FUSED))
         except RateLimitError as e:
             # Common case: insufficient_quota. Retrying won't help until billing/quota is fixed.
             logger.error("OpenAI request failed (RateLimitError). This usually means your API key has no remaining quota/billing.")
@@ -68,26 +107,32 @@ def run_trading_pipeline() -> bool:
             logger.error(f"Details: {e}")
             return False
         
-        logger.info(f"  GPT selected {len(gpt_response.picks)} companies:")
-        for pick in gpt_response.picks:
-            logger.info(f"    - {pick.ticker}: {pick.company}")
+        available_capital = account_info["cash"]
+        current_positions = account_info["positions"]
         
-        # Step 3: Claude analyzes fundamentals
-        logger.info("Step 3: Claude analyzing fundamental data...")
-        claude_response = analyze_fundamentals(gpt_response.picks)
+        if FUSED:
+            # Steps 3+4: one Grok call derives fundamentals and makes decisions
+            logger.info("Steps 3-4: Grok deriving fundamentals and making investment decisions (fused)...")
+            claude_response, grok_response = make_fused_investment_decision(
+                picks=gpt_response.picks,
+                available_capital=available_capital,
+                current_positions=current_positions
+            )
         
-        logger.info(f"  Claude analyzed {len(claude_response.fundamentals)} companies:")
+        source = "Grok" if FUSED else "Claude"
+        logger.info(f"  {source} analyzed {len(claude_response.fundamentals)} companies:")
         for fund in claude_response.fundamentals:
             logger.info(f"    - {fund.ticker}: P/E={fund.pe_ratio}, Growth={fund.earnings_growth}%")
         
-        # Step 4: Grok makes investment decisions
-        logger.info("Step 4: Grok making investment decisions...")
-        grok_response = make_investment_decision(
-            picks=gpt_response.picks,
-            fundamentals=claude_response.fundamentals,
-            available_capital=available_capital,
-            current_positions=current_positions
-        )
+        if not FUSED:
+            # Step 4: Grok makes investment decisions
+            logger.info("Step 4: Grok making investment decisions...")
+            grok_response = make_investment_decision(
+                picks=gpt_response.picks,
+                fundamentals=claude_response.fundamentals,
+                available_capital=available_capital,
+                current_positions=current_positions
+            )
         
         logger.info(f"  Grok made {len(grok_response.decisions)} decisions:")
         for decision in grok_response.decisions:
@@ -97,7 +142,7 @@ def run_trading_pipeline() -> bool:
         
         # Step 5: Execute trades via Alpaca
         logger.info("Step 5: Executing trades via Alpaca...")
-        trade_results = execute_trades(grok_response.decisions)
+        trade_results = execute_trades(grok_response.decisions, client=alpaca)
         
         # Check results
         all_successful = True
@@ -1,13 +1,13 @@
 """
 Data models for EDUARDO-V2 trading pipeline.
 """
-from dataclasses import dataclass, field, asdict
+from dataclasses import dataclass, field
 from typing import List, Optional
 from datetime import datetime
-import json
+import orjson
 
 
-@dataclass
+@dataclass(slots=True)
 class CompanyPick:
     """Company picked by GPT with rationale."""
     company: str
@@ -16,17 +16,18 @@ class CompanyPick:
     news_summary: str
 
 
-@dataclass
+@dataclass(slots=True)
 class GPTResponse:
     """Response from GPT containing 5 company picks."""
     picks: List[CompanyPick]
     timestamp: str = field(default_factory=lambda: datetime.now().isoformat())
     
     def to_json(self) -> str:
-        return json.dumps(asdict(self), indent=2)
+        # orjson serializes dataclasses natively, skipping asdict's deep copy
+        return orjson.dumps(self, option=orjson.OPT_INDENT_2).decode()
 
 
-@dataclass
+@dataclass(slots=True)
 class FundamentalData:
     """Fundamental data for a company from Claude."""
     company: str
@@ -40,19 +41,37 @@ class FundamentalData:
     dividend_yield: Optional[float]
     additional_metrics: dict = field(default_factory=dict)
     analysis_notes: str = ""
+    
+    @classmethod
+    def from_dict(cls, f: dict) -> "FundamentalData":
+        """Build from an LLM fundamentals entry; metric fields missing from `f` become None."""
+        return cls(
+            company=f["company"],
+            ticker=f["ticker"],
+            pe_ratio=f.get("pe_ratio"),
+            cash_flow=f.get("cash_flow"),
+            revenue=f.get("revenue"),
+            market_cap=f.get("market_cap"),
+            debt_to_equity=f.get("debt_to_equity"),
+            earnings_growth=f.get("earnings_growth"),
+            dividend_yield=f.get("dividend_yield"),
+            additional_metrics=f.get("additional_metrics", {}),
+            analysis_notes=f.get("analysis_notes", "")
+        )
 
 
-@dataclass
+@dataclass(slots=True)
 class ClaudeResponse:
     """Response from Claude with fundamental analysis."""
     fundamentals: List[FundamentalData]
     timestamp: str = field(default_factory=lambda: datetime.now().isoformat())
     
     def to_json(self) -> str:
-        return json.dumps(asdict(self), indent=2)
+        # orjson serializes dataclasses natively, skipping asdict's deep copy
+        return orjson.dumps(self, option=orjson.OPT_INDENT_2).decode()
 
 
-@dataclass
+@dataclass(slots=True)
 class InvestmentDecision:
     """Investment decision from Grok."""
     company: str
@@ -64,7 +83,18 @@ class InvestmentDecision:
     risk_assessment: str
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
+class Position:
+    """Snapshot of one held position from Alpaca."""
+    qty: float
+    market_value: float
+    avg_entry_price: float
+    current_price: float
+    unrealized_pl: float
+    unrealized_plpc: float
+
+
+@dataclass(slots=True)
 class GrokResponse:
     """Response from Grok with investment decisions."""
     decisions: List[InvestmentDecision]
@@ -73,10 +103,11 @@ class GrokResponse:
     timestamp: str = field(default_factory=lambda: datetime.now().isoformat())
     
     def to_json(self) -> str:
-        return json.dumps(asdict(self), indent=2)
+        # orjson serializes dataclasses natively, skipping asdict's deep copy
+        return orjson.dumps(self, option=orjson.OPT_INDENT_2).decode()
 
 
-@dataclass
+@dataclass(slots=True)
 class TradeResult:
     """Result of a trade execution."""
     ticker: str
@@ -3,25 +3,44 @@ Scheduler for EDUARDO-V2 weekly trading tasks.
 Runs every Monday at 8:30 AM CDT.
 """
 import schedule
-import time
+import signal
+import threading
+import queue
+import atexit
 import logging
+import logging.handlers
 from datetime import datetime, timedelta
-import pytz
-from typing import Callable
+from zoneinfo import ZoneInfo
+from typing import Callable, Type
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler('eduardo.log'),
-        logging.StreamHandler()
-    ]
-)
+# Configure logging. Records go onto a queue and a listener thread does the file and
+# console writes, so a slow disk never stalls the task or the run loop.
+_log_formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
+_log_handlers = [logging.FileHandler('eduardo.log'), logging.StreamHandler()]
+for _h in _log_handlers:
+    _h.setFormatter(_log_formatter)
+_log_queue = queue.SimpleQueue()
+_log_listener = logging.handlers.QueueListener(_log_queue, *_log_handlers)
+_log_listener.start()
+# Flush whatever is still queued when the process exits
+atexit.register(_log_listener.stop)
+# The queued record carries only the message; the listener's handlers add the rest
+_queue_handler = logging.handlers.QueueHandler(_log_queue)
+_queue_handler.setFormatter(logging.Formatter('%(message)s'))
+logging.basicConfig(level=logging.INFO, handlers=[_queue_handler])
 logger = logging.getLogger(__name__)
+# Logger methods bound once, so each call skips the global + attribute lookup
+_info, _warn, _err, _exc = logger.info, logger.warning, logger.error, logger.exception
 
 # CDT timezone
-CDT = pytz.timezone('America/Chicago')
+CDT = ZoneInfo('America/Chicago')
+
+# Log banner rule and timestamp format
+_BANNER = "=" * 50
+_TS_FMT = '%Y-%m-%d %H:%M:%S %Z'
+
+# Longest single sleep in the scheduler loop; bounds the damage of clock jumps
+MAX_IDLE_SECONDS = 3600
 
 
 class EduardoScheduler:
@@ -35,89 +54,107 @@ class EduardoScheduler:
             task_func: The main task function to run. Should return True on success, False on failure.
         """
         self.task_func = task_func
-        self.retry_scheduled = False
+        # Jobs live on this instance's own scheduler, not the schedule module's global one
+        self._scheduler = schedule.Scheduler()
+        # Set by stop(); the run loop waits on it so shutdown doesn't wait out a sleep
+        self._stop_event = threading.Event()
     
     def run_task(self) -> None:
         """Execute the main trading task with retry logic."""
-        logger.info("=" * 50)
-        logger.info("EDUARDO-V2 Weekly Task Starting")
-        logger.info(f"Current time: {datetime.now(CDT).strftime('%Y-%m-%d %H:%M:%S %Z')}")
-        logger.info("=" * 50)
+        _info(_BANNER)
+        _info("EDUARDO-V2 Weekly Task Starting")
+        _info("Current time: %s", datetime.now(CDT).strftime(_TS_FMT))
+        _info(_BANNER)
         
         try:
             success = self.task_func()
             
             if success:
-                logger.info("OK: Task completed successfully")
-                self.retry_scheduled = False
+                _info("OK: Task completed successfully")
+                # A pending retry is moot once the task has succeeded
+                self._scheduler.clear('retry')
             else:
-                logger.warning("FAIL: Task failed - scheduling retry for tomorrow")
+                _warn("FAIL: Task failed - scheduling retry for tomorrow")
                 self._schedule_retry()
                 
         except Exception as e:
-            logger.error(f"FAIL: Task failed with exception: {e}")
-            logger.exception("Full traceback:")
+            _err("FAIL: Task failed with exception: %s", e)
+            _exc("Full traceback:")
             self._schedule_retry()
     
     def _schedule_retry(self) -> None:
         """Schedule a retry for the next day at 8:30 AM CDT."""
-        if not self.retry_scheduled:
-            self.retry_scheduled = True
+        # The scheduler's own job list is the source of truth for a pending retry
+        if not self._scheduler.get_jobs('retry'):
             # Schedule one-time retry for tomorrow
-            schedule.every().day.at("08:30").do(self._retry_once).tag('retry')
-            logger.info("Retry scheduled for tomorrow at 8:30 AM CDT")
+            self._scheduler.every().day.at("08:30").do(self._retry_once).tag('retry')
+            _info("Retry scheduled for tomorrow at 8:30 AM CDT")
     
-    def _retry_once(self) -> schedule.CancelJob:
+    def _retry_once(self) -> Type[schedule.CancelJob]:
         """Run the task once as a retry, then cancel this job."""
-        logger.info("Executing scheduled retry...")
-        self.retry_scheduled = False
+        _info("Executing scheduled retry...")
         
         try:
             success = self.task_func()
             if success:
-                logger.info("OK: Retry successful")
+                _info("OK: Retry successful")
             else:
-                logger.warning("FAIL: Retry failed - will try again next Monday")
+                _warn("FAIL: Retry failed - will try again next Monday")
         except Exception as e:
-            logger.error(f"FAIL: Retry failed with exception: {e}")
+            _err("FAIL: Retry failed with exception: %s", e)
         
         # Cancel this retry job
         return schedule.CancelJob
     
     def start(self) -> None:
         """Start the scheduler - runs every Monday at 8:30 AM CDT."""
-        logger.info("=" * 50)
-        logger.info("EDUARDO-V2 Scheduler Starting")
-        logger.info("Schedule: Every Monday at 8:30 AM CDT")
-        logger.info("=" * 50)
+        _info(_BANNER)
+        _info("EDUARDO-V2 Scheduler Starting")
+        _info("Schedule: Every Monday at 8:30 AM CDT")
+        _info(_BANNER)
         
         # Schedule weekly task for Monday at 8:30 AM
-        schedule.every().monday.at("08:30").do(self.run_task)
+        self._scheduler.every().monday.at("08:30").do(self.run_task)
         
-        logger.info("Scheduler running. Press Ctrl+C to exit.")
+        # Signal handlers can only be installed from the main thread
+        if threading.current_thread() is threading.main_thread():
+            signal.signal(signal.SIGTERM, lambda *_: self.stop())
         
-        while True:
-            # Check if we need to run any scheduled tasks
-            schedule.run_pending()
-            time.sleep(60)  # Check every minute
+        _info("Scheduler running. Press Ctrl+C to exit.")
+        
+        try:
+            while not self._stop_event.is_set():
+                # Check if we need to run any scheduled tasks
+                self._scheduler.run_pending()
+                # Sleep until the next job is due rather than waking every minute
+                delay = self._scheduler.idle_seconds
+                if delay is None:
+                    delay = MAX_IDLE_SECONDS
+                self._stop_event.wait(timeout=max(1, min(delay, MAX_IDLE_SECONDS)))
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self._scheduler.clear()
+            _info("Scheduler stopped.")
+    
+    def stop(self) -> None:
+        """Ask a running start() loop to exit; safe to call from any thread or a signal handler."""
+        self._stop_event.set()
     
     def run_now(self) -> None:
         """Run the task immediately (for testing)."""
-        logger.info("Running task immediately (manual trigger)")
+        _info("Running task immediately (manual trigger)")
         self.run_task()
 
 
 def calculate_next_monday_830_cdt() -> datetime:
-    """Calculate the next Monday at 8:30 AM CDT."""
+    """Calculate the next Monday at 8:30 AM CDT (today, if it is Monday before 8:30)."""
     now = datetime.now(CDT)
-    days_until_monday = (7 - now.weekday()) % 7
-    if days_until_monday == 0 and now.hour >= 9:  # Past Monday morning
-        days_until_monday = 7
-    
-    next_monday = now + timedelta(days=days_until_monday)
-    next_monday = next_monday.replace(hour=8, minute=30, second=0, microsecond=0)
-    
-    return next_monday
+    # weekday() is 0 on Monday, so this is the number of days until the coming Monday
+    candidate = (now + timedelta(days=-now.weekday() % 7)).replace(
+        hour=8, minute=30, second=0, microsecond=0
+    )
+    return candidate if candidate > now else candidate + timedelta(days=7)
 
 
 if __name__ == "__main__":
@@ -130,7 +167,7 @@ if __name__ == "__main__":
     
     # Show next scheduled run
     next_run = calculate_next_monday_830_cdt()
-    print(f"Next scheduled run: {next_run.strftime('%Y-%m-%d %H:%M:%S %Z')}")
+    print(f"Next scheduled run: {next_run.strftime(_TS_FMT)}")
     
     # Run immediately for testing
     scheduler.run_now()
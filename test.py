@@ -1,14 +1,41 @@
+from __future__ import annotations
+
+import operator
 import os
-from alpaca.trading.client import TradingClient
-from alpaca.data.requests import StockLatestQuoteRequest
-from alpaca.data.historical import StockHistoricalDataClient
+from typing import TYPE_CHECKING
+
+# alpaca-py is imported where it's used, so loading this module stays cheap
+if TYPE_CHECKING:
+    from alpaca.data.historical import StockHistoricalDataClient
+    from alpaca.trading.client import TradingClient
+
+# Credentials are read once; both clients are built on first use and then reused
+API_KEY = os.environ.get("eduardo_v2_key")
+API_SECRET = os.environ.get("eduardo_v2_secret")
+_CLIENT = None
+_DATA_CLIENT = None
+
+# Position fields reported per symbol, fetched in one attrgetter call per position
+_POS_FIELDS = (
+    "qty",
+    "market_value",
+    "avg_entry_price",
+    "current_price",
+    "unrealized_pl",
+    "unrealized_plpc",
+)
+_get_pos_fields = operator.attrgetter(*_POS_FIELDS)
+
 
 def get_alpaca_client() -> TradingClient:
-    """Initialize Alpaca client with API keys from environment."""
-    api_key = os.environ.get("eduardo_v2_key")
-    api_secret = os.environ.get("eduardo_v2_secret")
-    #potential to do: specify paper trading
-    return TradingClient(api_key, api_secret)
+    """Return the shared Alpaca client, initializing it on first use."""
+    global _CLIENT
+    if _CLIENT is None:
+        from alpaca.trading.client import TradingClient
+        
+        #potential to do: specify paper trading
+        _CLIENT = TradingClient(API_KEY, API_SECRET)
+    return _CLIENT
 
 
 def get_account_info() -> dict:
@@ -27,16 +54,10 @@ def get_account_info() -> dict:
     account = client.get_account()
     positions = client.get_all_positions()
 
-    positions_dict = {}
-    for pos in positions:
-        positions_dict[pos.symbol] = {
-            "qty": float(pos.qty),
-            "market_value": float(pos.market_value),
-            "avg_entry_price": float(pos.avg_entry_price),
-            "current_price": float(pos.current_price),
-            "unrealized_pl": float(pos.unrealized_pl),
-            "unrealized_plpc": float(pos.unrealized_plpc)
-        }
+    positions_dict = {
+        pos.symbol: dict(zip(_POS_FIELDS, map(float, _get_pos_fields(pos))))
+        for pos in positions
+    }
     
     return {
         "cash": float(account.cash),
@@ -45,15 +66,21 @@ def get_account_info() -> dict:
         "positions": positions_dict
     }
 
-from alpaca.data.historical import StockHistoricalDataClient
-from alpaca.data.requests import StockLatestQuoteRequest
-import os
+
+def get_data_client() -> StockHistoricalDataClient:
+    """Return the shared market-data client, initializing it on first use."""
+    global _DATA_CLIENT
+    if _DATA_CLIENT is None:
+        from alpaca.data.historical import StockHistoricalDataClient
+        
+        _DATA_CLIENT = StockHistoricalDataClient(API_KEY, API_SECRET)
+    return _DATA_CLIENT
+
 
 def get_current_stock_price(symbol: str) -> float:
-    data_client = StockHistoricalDataClient(
-        os.environ["eduardo_v2_key"],
-        os.environ["eduardo_v2_secret"],
-    )
+    from alpaca.data.requests import StockLatestQuoteRequest
+    
+    data_client = get_data_client()
 
     req = StockLatestQuoteRequest(symbol_or_symbols=symbol)  # <-- FIX
     quotes = data_client.get_stock_latest_quote(req)
@@ -62,4 +89,5 @@ def get_current_stock_price(symbol: str) -> float:
     return float(q.ask_price)  # or q.bid_price, or (q.bid_price + q.ask_price)/2
 
 
-print(get_current_stock_price("AAPL"))
\ No newline at end of file
+if __name__ == "__main__":
+    print(get_current_stock_price("AAPL"))